@@ -1,17 +1,28 @@
 # -*- coding: utf-8 -*-
+import io
 import os
+import re
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime
 
-import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
+
+from lttb import reducir_serie
 import subprocess
 
 # Configuración
 activos = ['spy', 'spx', 'qqq', 'ndx']
+DEBOUNCE_SEG = 2.0  # Ventana para agrupar eventos repetidos de un mismo guardado
+MAX_PUNTOS = 2000  # Puntos por traza enviados al navegador
+# Históricos a vigilar: <activo>..._gex_history.csv
+PATRON_CSV = re.compile(r'^(?:' + '|'.join(map(re.escape, activos)) + r').*_gex_history\.csv$')
 columnas = [
     "Time", "MAXGEX", "MINGEX", "MAXVEX", "MINVEX",
     "MAXDEX", "MINDEX", "ZERO", "BAC", "SAC", "BAP", "SAP",
@@ -49,27 +60,191 @@ carpeta_csv = r"E:\GEX\Sync"
 # Ruta donde guardar los HTML (puede ser diferente si quieres)
 carpeta_salida = r"E:\GEX\GitHub\Gex-Repository" #os.getcwd()
 
+def plantilla_traza(col):
+    estilo = estilos.get(col, {'color': 'gray', 'symbol': 'circle', 'mode': 'markers'})
+    marker_props = {'color': estilo['color']}
+    if estilo['symbol']:
+        marker_props['symbol'] = estilo['symbol']
+    if 'size' in estilo:
+        marker_props['size'] = estilo['size']
+
+    # Diccionario plano (sin validación de plotly): solo claves con valor
+    traza = dict(
+        type='scattergl',
+        mode=estilo['mode'],
+        name=col,
+        marker=marker_props,
+        visible=True if col == 'SPOT' else 'legendonly'
+    )
+    if estilo['mode'] == 'lines':
+        traza['line'] = dict(color=estilo['color'])
+    return traza
+
+# Estilo de cada traza calculado una sola vez; en cada evento solo cambian x e y
+TRACE_TEMPLATES = {col: plantilla_traza(col) for col in columnas if col != 'Time'}
+
+# Layout común a todos los activos; por archivo solo se añaden título y uirevision
+LAYOUT = dict(
+    xaxis=dict(title=dict(text="Tiempo")),
+    yaxis=dict(title=dict(text="Valor")),
+    plot_bgcolor="black",
+    paper_bgcolor="black",
+    font=dict(color="white"),
+    autosize=True,
+    margin=dict(l=20, r=20, t=40, b=20),
+    template=pio.templates[pio.templates.default],
+    # Sin height: lo define el contenedor
+)
+
+# Página estática: se escribe una sola vez por activo y cada 30 segundos
+# recarga los datos desde {base}.json con Plotly.react (sin recargar la página)
+HTML_SHELL = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <script src="https://cdn.plot.ly/plotly-{plotly_version}.min.js"></script>
+    <style>
+        html, body {{
+            margin: 0;
+            padding: 0;
+            height: 100%;
+            background-color: black;
+            overflow: hidden;
+        }}
+        #chart {{
+            width: 100vw;
+            height: 100vh;
+        }}
+    </style>
+</head>
+<body>
+<div id="chart"></div>
+<script>
+    const STORAGE_KEY = 'plotly_visibility';
+    const DATA_URL = '{base}.json';
+    let eventosRegistrados = false;
+
+    function aplicarVisibilidad(data) {{
+        const visibility = JSON.parse(localStorage.getItem(STORAGE_KEY));
+        if (visibility && visibility.length === data.length) {{
+            data.forEach((trace, i) => {{ trace.visible = visibility[i]; }});
+        }}
+    }}
+
+    function actualizar() {{
+        fetch(DATA_URL + '?t=' + Date.now(), {{cache: 'no-store'}})
+            .then(r => r.json())
+            .then(spec => {{
+                aplicarVisibilidad(spec.data);
+                return Plotly.react('chart', spec.data, spec.layout, {{responsive: true}});
+            }})
+            .then(gd => {{
+                if (eventosRegistrados) return;
+                eventosRegistrados = true;
+
+                gd.on('plotly_legendclick', function(eventData) {{
+                    const visibilities = gd.data.map(trace => trace.visible || true);
+                    const i = eventData.curveNumber;
+                    visibilities[i] = visibilities[i] === 'legendonly' ? true : 'legendonly';
+                    localStorage.setItem(STORAGE_KEY, JSON.stringify(visibilities));
+                }});
+            }})
+            .catch(err => console.error('Error cargando ' + DATA_URL, err));
+    }}
+
+    actualizar();
+    setInterval(actualizar, 30000);
+</script>
+</body></html>
+"""
+
+def escribir_atomico(ruta, partes):
+    """Escribe los trozos en un temporal y lo renombra: el navegador nunca lee un archivo a medias"""
+    tmp = ruta + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for parte in partes:
+            f.write(parte)
+    os.replace(tmp, ruta)
+
+def partes_json(fig):
+    """Serializa la figura traza a traza para no armar todo el JSON en memoria"""
+    yield '{"data":['
+    for i, traza in enumerate(fig['data']):
+        if i:
+            yield ','
+        yield pio.json.to_json_plotly(traza)
+    yield '],"layout":'
+    yield pio.json.to_json_plotly(fig['layout'])
+    yield '}'
+
+# Bases que ya tienen su página escrita en esta ejecución
+_paginas = set()
+
+def escribir_pagina(base):
+    nombre_html = os.path.join(carpeta_salida, f"{base}.html")
+    escribir_atomico(nombre_html, [HTML_SHELL.format(base=base, plotly_version=get_plotlyjs_version())])
+    _paginas.add(base)
+
+# Columnas numéricas con tipo fijo: evita la inferencia y mantiene el mismo dtype entre lecturas
+DTYPES = {col: 'float64' for col in columnas if col != 'Time'}
+
+# Caché de lectura incremental: ruta -> (bytes ya procesados, DataFrame acumulado)
+_cache = {}
+
+# Última (mtime, tamaño) graficada de cada CSV
+_seen = {}
+
+def leer_incremental(ruta_csv):
+    """Devuelve el historial completo leyendo del disco solo las filas añadidas"""
+    offset, df_prev = _cache.get(ruta_csv, (0, None))
+    if os.path.getsize(ruta_csv) < offset:
+        # El archivo se reinició (nuevo día): volver a leer desde el principio
+        offset, df_prev = 0, None
+
+    with open(ruta_csv, "rb") as f:
+        f.seek(offset)
+        tail = f.read()
+
+    # Una última línea a medio escribir se deja para la próxima lectura
+    fin = tail.rfind(b"\n") + 1
+    if fin == 0:
+        return df_prev
+
+    # La primera línea del archivo puede ser la cabecera
+    saltar = 1 if offset == 0 and tail.startswith(b"Time") else 0
+    df = pd.read_csv(io.BytesIO(tail[:fin]), header=None, names=columnas, skiprows=saltar,
+                     engine='pyarrow', dtype=DTYPES)
+    # Formato fijo de los históricos (p. ej. 2026-04-26 09:51:00), con día primero como alternativa
+    tiempos = pd.to_datetime(df['Time'], format='%Y-%m-%d %H:%M:%S', cache=True, errors='coerce')
+    faltan = tiempos.isna()
+    if faltan.any():
+        tiempos[faltan] = pd.to_datetime(df.loc[faltan, 'Time'], format='%d/%m/%Y %H:%M:%S',
+                                         cache=True, errors='coerce')
+    df['Time'] = tiempos
+    descartadas = int(df['Time'].isna().sum())
+    if descartadas:
+        print(f"⚠️ {descartadas} filas con fecha ilegible descartadas en {ruta_csv}")
+        df.dropna(subset=['Time'], inplace=True)
+    df.set_index('Time', inplace=True)
+
+    if df_prev is not None:
+        df = pd.concat([df_prev, df])
+    _cache[ruta_csv] = (offset + fin, df)
+    return df
+
 def graficar_archivo(ruta_csv):
     base = os.path.splitext(os.path.basename(ruta_csv))[0]
-    nombre_html = os.path.join(carpeta_salida, f"{base}.html")
+    nombre_json = os.path.join(carpeta_salida, f"{base}.json")
 
     try:
-        # Leer CSV usando un parser de fechas más flexible
-        df = pd.read_csv(ruta_csv, header=None, names=columnas)
-        
-        # Intentar convertir la columna Time a datetime con manejo de errores
-        try:
-            # Intentar el formato específico primero
-            df['Time'] = pd.to_datetime(df['Time'], format='%Y-%m-%d %H:%M:%S')
-        except ValueError:
-            # Si falla, intentar con formato inferido
-            try:
-                df['Time'] = pd.to_datetime(df['Time'], format='%Y-%m-%d')
-            except ValueError:
-                # Si todo falla, intentar con el formato más flexible
-                df['Time'] = pd.to_datetime(df['Time'], format='mixed')
-                
-        df.set_index('Time', inplace=True)
+        # Evento sin cambios reales (solo metadatos): no hay nada que regenerar
+        st = os.stat(ruta_csv)
+        firma = (st.st_mtime_ns, st.st_size)
+        if _seen.get(ruta_csv) == firma:
+            return
+
+        # Solo se parsean las filas nuevas desde la última actualización
+        df = leer_incremental(ruta_csv)
 
         ##df = df.between_time("08:30", "15:15")  # opcional
 
@@ -77,117 +252,98 @@ def graficar_archivo(ruta_csv):
         print(f"❌ Error leyendo {ruta_csv}: {e}")
         return
 
-    fig = go.Figure()
+    if df is None or df.empty:
+        return
 
+    x = df.index.values
+    traces = []
     for col in df.columns:
-        estilo = estilos.get(col, {'color': 'gray', 'symbol': 'circle', 'mode': 'markers'})
-        marker_props = {
-            'color': estilo['color'],
-            'symbol': estilo['symbol'],
-        }
-        if 'size' in estilo:
-            marker_props['size'] = estilo['size']
-
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df[col],
-            mode=estilo['mode'],
-            name=col,
-            marker=marker_props,
-            line=dict(color=estilo['color']) if estilo['mode'] == 'lines' else None,
-            visible=True if col == 'SPOT' else 'legendonly'
-        ))
-
-    fig.update_layout(
-        title=f"GEX History: {base.upper()}",
-        xaxis_title="Tiempo",
-        yaxis_title="Valor",
-        plot_bgcolor="black",
-        paper_bgcolor="black",
-        font=dict(color="white"),
-        autosize=True,
-        margin=dict(l=20, r=20, t=40, b=20),
-        height=None,
+        # Con el día avanzado cada serie se reduce a MAX_PUNTOS (LTTB) antes de enviarla
+        xs, ys = reducir_serie(x, df[col].to_numpy(copy=False), MAX_PUNTOS)
+        traces.append(dict(TRACE_TEMPLATES[col], x=xs, y=ys))
+    layout = dict(
+        LAYOUT,
+        title=dict(text=f"GEX History: {base.upper()}"),
+        uirevision=base,  # Conservar zoom y leyenda entre actualizaciones
     )
+    # Las trazas salen de estilos conocidos: se serializan sin pasar por la validación de plotly
+    fig = {'data': traces, 'layout': layout}
+
+    # Solo se reescriben los datos; la página HTML es estática
+    escribir_atomico(nombre_json, partes_json(fig))
+    _seen[ruta_csv] = firma
 
-    html_temp = """<!DOCTYPE html>
-    <html>
-    <head>
-        <meta http-equiv="refresh" content="30">
-        <style>
-            html, body {
-                margin: 0;
-                padding: 0;
-                height: 100%;
-                background-color: black;
-                overflow: hidden;
-            }
-            #chart {
-                width: 100vw;
-                height: 100vh;
-            }
-        </style>
-    </head>
-    <body>
-    <div id="chart">
-    """
-    html_temp += fig.to_html(full_html=False, include_plotlyjs='cdn', div_id='chart')
-    html_temp += "</div>"
-
-    html_temp += """
-    <script>
-        const STORAGE_KEY = 'plotly_visibility';
-
-        window.addEventListener('load', () => {
-            const gd = document.querySelector('.js-plotly-plot');
-            const visibility = JSON.parse(localStorage.getItem(STORAGE_KEY));
-            if (visibility && gd && gd.data) {
-                Plotly.restyle(gd, 'visible', visibility);
-            }
-        });
-
-        window.addEventListener('DOMContentLoaded', () => {
-            const gd = document.querySelector('.js-plotly-plot');
-            if (!gd) return;
-
-            gd.on('plotly_legendclick', function(eventData) {
-                const visibilities = gd.data.map(trace => trace.visible || true);
-                const i = eventData.curveNumber;
-                visibilities[i] = visibilities[i] === 'legendonly' ? true : 'legendonly';
-                localStorage.setItem(STORAGE_KEY, JSON.stringify(visibilities));
-            });
-        });
-    </script>
-    </body></html>
-    """
-
-    with open(nombre_html, "w", encoding="utf-8") as f:
-        f.write(html_temp)
-
-    print(f"✅ Gráfico generado: {nombre_html}")
+    # Cualquier CSV que cumpla PATRON_CSV (p. ej. spy_0dte_gex_history) necesita su página
+    if base not in _paginas:
+        escribir_pagina(base)
+
+    print(f"✅ Datos actualizados: {nombre_json}")
 
 
 class CSVHandler(FileSystemEventHandler):
+    """Agrupa las ráfagas de eventos: solo el último de cada archivo regenera el gráfico"""
+
+    def __init__(self):
+        super().__init__()
+        self._pending = {}
+        # Un hilo por activo; cada ruta se procesa de a una vez (ver _en_curso)
+        self._pool = ThreadPoolExecutor(max_workers=len(activos))
+        self._en_curso = set()
+        self._repetir = set()
+        self._lock = threading.Lock()
+
     def on_modified(self, event):
         if event.is_directory:
             return
         nombre = os.path.basename(event.src_path).lower()
-        if any(nombre.startswith(activo) and nombre.endswith("_gex_history.csv") for activo in activos):
-            print(f"📊 Procesando archivo: {event.src_path}")
-            graficar_archivo(event.src_path)
+        if PATRON_CSV.match(nombre):
+            marca = time.monotonic()
+            with self._lock:
+                self._pending[event.src_path] = marca
+            timer = threading.Timer(DEBOUNCE_SEG, self._maybe_run, args=(event.src_path, marca))
+            timer.daemon = True
+            timer.start()
+
+    def _maybe_run(self, ruta, marca):
+        with self._lock:
+            # Llegó un evento más reciente: su propio timer se encargará
+            if self._pending.get(ruta) != marca:
+                return
+            del self._pending[ruta]
+            if ruta in self._en_curso:
+                # Ya se está procesando: se repite al terminar con los datos nuevos
+                self._repetir.add(ruta)
+                return
+            self._en_curso.add(ruta)
+        self._pool.submit(self._procesar, ruta)
+
+    def _procesar(self, ruta):
+        while True:
+            print(f"📊 Procesando archivo: {ruta}")
+            try:
+                graficar_archivo(ruta)
+            except Exception as e:
+                print(f"❌ Error procesando {ruta}: {e}")
+            with self._lock:
+                if ruta not in self._repetir:
+                    self._en_curso.discard(ruta)
+                    return
+                self._repetir.discard(ruta)
 
 
 if __name__ == "__main__":
+    event_handler = CSVHandler()
+
     # Procesar archivos existentes al inicio
     print(f"🔍 Buscando archivos existentes en: {carpeta_csv}")
     for activo in activos:
+        escribir_pagina(f"{activo}_gex_history")
         csv_file = os.path.join(carpeta_csv, f"{activo}_gex_history.csv")
         if os.path.exists(csv_file):
             print(f"📊 Procesando archivo existente: {csv_file}")
             graficar_archivo(csv_file)
 
     # Configurar observador para cambios en archivos
-    event_handler = CSVHandler()
     observer = Observer()
     observer.schedule(event_handler, path=carpeta_csv, recursive=False)
     observer.start()
@@ -16,19 +16,26 @@ images = sorted([
 if not images:
     print("No se encontraron imágenes para hoy.")
 else:
-    # Cargar las imágenes
-    frames = [Image.open(os.path.join(folder, img)) for img in images]
+    paths = [os.path.join(folder, img) for img in images]
+
+    # Abrir cada imagen solo cuando el GIF la necesita y cerrarla enseguida
+    def abrir_frames(rutas):
+        for ruta in rutas:
+            with Image.open(ruta) as frame:
+                yield frame
 
     # Guardar como GIF animado
     output_path = os.path.join(folder, f"output_{today}.gif")
-    frames[0].save(
-        output_path,
-        format='GIF',
-        append_images=frames[1:],
-        save_all=True,
-        duration=300,  # milisegundos por frame
-        loop=0
-    )
+    with Image.open(paths[0]) as first:
+        first.save(
+            output_path,
+            format='GIF',
+            append_images=abrir_frames(paths[1:]),
+            save_all=True,
+            duration=300,  # milisegundos por frame
+            loop=0,
+            optimize=False
+        )
 
     print(f"GIF creado: {output_path}")
 
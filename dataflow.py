@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import os
 import glob
+import json
 from datetime import datetime
 
 # Configuración
@@ -31,11 +33,12 @@ total_generados = 0
 def crear_grafico(df, base, carpeta):
     """Crea el gráfico interactivo con opción de acumulado"""
     fig = go.Figure()
+    x = df.index.values
     
     # SPOT (siempre en eje Y1)
-    fig.add_trace(go.Scatter(
-        x=df.index,
-        y=df["SPOT"],
+    fig.add_trace(go.Scattergl(
+        x=x,
+        y=df["SPOT"].to_numpy(copy=False),
         mode="lines",
         name="SPOT",
         line=dict(color=colores_flujo["SPOT"], width=2),
@@ -49,8 +52,8 @@ def crear_grafico(df, base, carpeta):
             continue
             
         fig.add_trace(go.Bar(
-            x=df.index,
-            y=df[col],
+            x=x,
+            y=df[col].to_numpy(copy=False),
             name=col,
             marker_color=colores_flujo[col],
             opacity=0.7,
@@ -59,33 +62,28 @@ def crear_grafico(df, base, carpeta):
         ))
     
     # Trazas para modo ACUMULADO (líneas + marcadores)
+    # GEX_BY_OI y GEX_BY_VOLUME ya vienen acumulados; el resto se acumula en un solo bloque
+    columnas_acum = [col for col in df.columns
+                     if col in colores_flujo and col not in ("SPOT", "GEX_BY_OI", "GEX_BY_VOLUME")]
+    bloque = df[columnas_acum].to_numpy(dtype=np.float64)
+    acumulados = np.nancumsum(bloque, axis=0)
+    acumulados[np.isnan(bloque)] = np.nan  # Igual que pandas: los huecos siguen vacíos
+    posicion = {col: j for j, col in enumerate(columnas_acum)}
+
     for col in df.columns:
         if col == "SPOT" or col not in colores_flujo:
             continue
-            
-        # Solo GEX_BY_OI y GEX_BY_VOLUME en modo acumulado
-        if col in ["GEX_BY_OI", "GEX_BY_VOLUME"]:
-            fig.add_trace(go.Scatter(
-                x=df.index,
-                y=df[col].cumsum() if col not in ["GEX_BY_OI", "GEX_BY_VOLUME"] else df[col],
-                mode="lines+markers",
-                name=f"{col} (Acum)",
-                line=dict(color=colores_flujo[col], width=2),
-                marker=dict(color=colores_flujo[col], size=6),
-                yaxis="y2",
-                visible=True if col == 'SPOT' else 'legendonly'  # Oculto inicialmente
-            ))
-        else:
-            fig.add_trace(go.Scatter(
-                x=df.index,
-                y=df[col].cumsum(),
-                mode="lines+markers",
-                name=f"{col} (Acum)",
-                line=dict(color=colores_flujo[col], width=2),
-                marker=dict(color=colores_flujo[col], size=6),
-                yaxis="y2",
-                visible=True if col == 'SPOT' else 'legendonly'  # Oculto inicialmente
-            ))
+
+        fig.add_trace(go.Scattergl(
+            x=x,
+            y=acumulados[:, posicion[col]] if col in posicion else df[col].to_numpy(copy=False),
+            mode="lines+markers",
+            name=f"{col} (Acum)",
+            line=dict(color=colores_flujo[col], width=2),
+            marker=dict(color=colores_flujo[col], size=6),
+            yaxis="y2",
+            visible='legendonly'  # Oculto inicialmente
+        ))
     
     # Botones para cambiar entre modos
     fig.update_layout(
@@ -106,6 +104,24 @@ def crear_grafico(df, base, carpeta):
 
     return fig
 
+def listar_html(carpeta, cache):
+    """Listados de HTML de una carpeta, reutilizando la caché mientras su mtime no cambie"""
+    mtime = os.stat(carpeta).st_mtime_ns
+    entrada = cache.get(carpeta)
+    if entrada and entrada["mtime"] == mtime:
+        return entrada
+
+    with os.scandir(carpeta) as it:
+        nombres = sorted(e.name for e in it if e.is_file() and e.name.endswith(".html"))
+    entrada = {
+        "mtime": mtime,
+        "gex": [f"{carpeta}/{n}" for n in nombres if n.endswith("gex_history.html")],
+        "flow": [f"{carpeta}/{n}" for n in nombres if n.endswith("_data_flow.html")],
+        "heatmap": [f"{carpeta}/{n}" for n in nombres if "_heatmap" in n],
+    }
+    cache[carpeta] = entrada
+    return entrada
+
 # Procesar archivos
 for carpeta in carpetas:
     archivos_csv = glob.glob(f"{carpeta}/*_data_flow.csv")
@@ -138,6 +154,15 @@ for carpeta in carpetas:
             print(f"Error procesando {ruta_csv}: {e}")
             continue
 
+# Listados por carpeta de la ejecución anterior (un solo archivo, fuera de las carpetas
+# para que escribirlo no altere su mtime)
+INDICE_CACHE = ".index_cache.json"
+try:
+    with open(INDICE_CACHE, encoding="utf-8") as f:
+        cache_listados = json.load(f)
+except (OSError, ValueError):
+    cache_listados = {}
+
 # Generar índice HTML actualizado con columna de heatmaps
 html_index = """<html>
 <head>
@@ -211,12 +236,13 @@ html_index = """<html>
 """
 
 for carpeta in reversed(carpetas):
+    listado = listar_html(carpeta, cache_listados)
     # Archivos GEX History
-    archivos_gex = sorted(glob.glob(f"{carpeta}/*gex_history.html"))
+    archivos_gex = listado["gex"]
     # Archivos Data Flow
-    archivos_flow = sorted(glob.glob(f"{carpeta}/*_data_flow.html"))
+    archivos_flow = listado["flow"]
     # Archivos Heatmap
-    archivos_heatmap = sorted(glob.glob(f"{carpeta}/*_heatmap*.html"))
+    archivos_heatmap = listado["heatmap"]
     
     html_index += f"""
     <tr>
@@ -269,6 +295,9 @@ html_index += """
 with open("index.html", "w", encoding="utf-8") as f:
     f.write(html_index)
 
+with open(INDICE_CACHE, "w", encoding="utf-8") as f:
+    json.dump(cache_listados, f)
+
 print(f"\n✔ {total_generados} nuevos heatmaps generados")
 print(f"✔ Índice completo actualizado: index_completo.html")
 print(f"📊 Dashboard completo con GEX History, Data Flow y Heatmaps disponible")
\ No newline at end of file
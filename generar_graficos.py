@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
-import pandas as pd
-import plotly.graph_objects as go
+import base64
+import bisect
+import json
 import os
-import glob
+from concurrent.futures import ProcessPoolExecutor
+
+# numpy, pandas, pyarrow y plotly se importan en cargar_librerias(), solo si hay CSV pendientes
 
 # Columnas del CSV
 columnas = [
@@ -35,281 +38,399 @@ estilos = {
     'SHORTPUTS':  {'color': 'magenta',  'symbol': 'cross',        'mode': 'markers'},
 }
 
-# Buscar carpetas con nombre de fecha
-carpetas = sorted([f for f in os.listdir() if os.path.isdir(f) and f[:4].isdigit()])
-
-total_generados = 0
-
-for carpeta in carpetas:
-    archivos_csv = glob.glob(f"{carpeta}/*_gex_history.csv")
-
-    for ruta_csv in archivos_csv:
-        base = os.path.splitext(os.path.basename(ruta_csv))[0]  # ej: spy_gex_history
-        nombre_html = os.path.join(carpeta, f"{base}.html")
-
-        if os.path.exists(nombre_html):
-            continue  # ya existe, saltar
+DEFAULT_ESTILO = {'color': 'gray', 'symbol': 'circle', 'mode': 'markers'}
 
-        print(f"??? Generando: {nombre_html}")
+# Propiedades de marcador de cada señal, calculadas una sola vez (SPOT no lleva símbolo)
+MARKER_PROPS = {
+    col: {'color': v['color'],
+          **({'symbol': v['symbol']} if v['symbol'] else {}),
+          **({'size': v['size']} if 'size' in v else {})}
+    for col, v in estilos.items()
+}
+DEFAULT_MARKER = {'color': DEFAULT_ESTILO['color'], 'symbol': DEFAULT_ESTILO['symbol']}
 
-        # Leer CSV
-        try:
-            df = pd.read_csv(ruta_csv, header=None, names=columnas)
-            df['Time'] = pd.to_datetime(df['Time'], dayfirst=True)
-            df.set_index('Time', inplace=True)
+# Ventana de sesión en segundos del día: 08:30 a 15:15
+HORA_INICIO = 8 * 3600 + 30 * 60
+HORA_FIN = 15 * 3600 + 15 * 60
 
-            # Filtrar datos entre las 08:30 y las 15:15
-            hora_inicio = pd.to_datetime("08:30").time()
-            hora_fin = pd.to_datetime("15:15").time()
-            df = df.between_time(hora_inicio, hora_fin)
+# Puntos máximos por traza en el HTML (LTTB); las series más cortas no se tocan
+PUNTOS_LINEA = 3000
+PUNTOS_MARCADOR = 2000
 
-        except Exception as e:
-            print(f"? Error leyendo {ruta_csv}: {e}")
-            continue
+# Layout común; con validate=False plotly no aplica la plantilla por defecto,
+# cargar_librerias() la añade aquí
+LAYOUT = dict(
+    xaxis=dict(title=dict(text="Tiempo"), type="date"),
+    yaxis=dict(title=dict(text="Valor")),
+    # Fondos transparentes: el negro lo pone el CSS de la página (sin esto la plantilla los pinta claros)
+    plot_bgcolor="rgba(0,0,0,0)",
+    paper_bgcolor="rgba(0,0,0,0)",
+    font=dict(color="white"),
+    autosize=True,
+)
 
-        # Crear figura
-        fig = go.Figure()
-    
-        for col in df.columns:
-            estilo = estilos.get(col, {'color': 'gray', 'symbol': 'circle', 'mode': 'markers'})
-            marker_props = {
-                'color': estilo['color'],
-                'symbol': estilo['symbol'],
-            }
-            if 'size' in estilo:
-                marker_props['size'] = estilo['size']
-
-            fig.add_trace(go.Scatter(
-                x=df.index,
-                y=df[col],
-                mode=estilo['mode'],
-                name=col,
-                marker=marker_props,
-                line=dict(color=estilo['color']) if estilo['mode'] == 'lines' else None,
-                visible=True if col == 'SPOT' else 'legendonly'
-            ))
-    
-        fig.update_layout(
-            title=f"Evolución indicadores: {base.upper()}",
-            xaxis_title="Tiempo",
-            yaxis_title="Valor",
-            plot_bgcolor="black",
-            paper_bgcolor="black",
-            font=dict(color="white"),
-            autosize=True
-        )
-        html_temp = """<!DOCTYPE html>
-        <html>
-        <head>
-            <meta http-equiv="refresh" content="30">
-            <style>
-                html, body {
-                    margin: 0;
-                    padding: 0;
-                    height: 100%;
-                    background-color: black;
-                    overflow: hidden;
-                }
-                #chart {
-                    width: 100vw;
-                    height: 100vh;
-                }
-            </style>
-        </head>
-        <body>
-        <div id="chart">
-        """
-        html_temp += fig.to_html(full_html=False, include_plotlyjs='cdn', div_id='chart')
-        html_temp += "</div>"
-
-        html_temp += f"""
-        <script>
-            const STORAGE_KEY = 'plotly_visibility';
-            const RANGE_STORAGE_KEY = 'plotly_axis_ranges_{base}';
-
-            window.addEventListener('load', () => {{
-                const gd = document.querySelector('.js-plotly-plot');
-                const visibility = JSON.parse(localStorage.getItem(STORAGE_KEY));
-                const savedLayout = JSON.parse(localStorage.getItem(RANGE_STORAGE_KEY));
-
-                // Restaurar visibilidad común
-                if (visibility && gd && gd.data) {{
-                    Plotly.restyle(gd, 'visible', visibility);
-                }}
-
-                // Restaurar rango de ejes específico de este activo
-                if (savedLayout && gd) {{
-                    Plotly.relayout(gd, savedLayout);
-                }}
-            }});
-
-            window.addEventListener('DOMContentLoaded', () => {{
-                const gd = document.querySelector('.js-plotly-plot');
-                if (!gd) return;
-
-                // Guardar visibilidad común
-                gd.on('plotly_legendclick', function(eventData) {{
-                    const visibilities = gd.data.map(trace => trace.visible || true);
-                    const i = eventData.curveNumber;
-                    visibilities[i] = visibilities[i] === 'legendonly' ? true : 'legendonly';
-                    localStorage.setItem(STORAGE_KEY, JSON.stringify(visibilities));
-                }});
-
-                // Guardar rango de ejes específico de este activo
-                gd.on('plotly_relayout', function(eventData) {{
-                    const ranges = {{}};
-                    for (const key in eventData) {{
-                        if (key.includes('range')) {{
-                            ranges[key] = eventData[key];
-                        }}
-                    }}
-                    if (Object.keys(ranges).length > 0) {{
-                        localStorage.setItem(RANGE_STORAGE_KEY, JSON.stringify(ranges));
-                    }}
-                }});
-            }});
-        </script>
-        </body></html>
-        """
-       
-
-
-
-        with open(nombre_html, "w", encoding="utf-8") as f:f.write(html_temp)
-
-        total_generados += 1
-
-# Generar índice HTML actualizado con columna de heatmaps
-html_index = """<html>
+# Página HTML: partes fijas codificadas una sola vez al importar el módulo
+PAGINA_INICIO = """<!DOCTYPE html>
+<html>
 <head>
-    <title>GEX Dashboard - Índice Completo</title>
+    <meta http-equiv="refresh" content="30">
     <style>
-        body {
-            background-color: black; 
-            color: white; 
-            font-family: Arial;
-            margin: 20px;
-        }
-        h1 {
-            color: cyan;
-            text-align: center;
-        }
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 20px;
-        }
-        th {
-            background-color: #333;
-            color: white;
-            padding: 10px;
-            text-align: left;
+        html, body {
+            margin: 0;
+            padding: 0;
+            height: 100%;
+            background-color: black;
+            overflow: hidden;
         }
-        td {
-            padding: 8px;
-            border-bottom: 1px solid #444;
-            vertical-align: top;
+        #chart {
+            width: 100vw;
+            height: 100vh;
         }
-        tr:hover {
-            background-color: #222;
+        .js-plotly-plot, .plot-container {
+            background: black !important;
         }
-        a {
-            color: cyan;
-            text-decoration: none;
-        }
-        a:hover {
-            text-decoration: underline;
-        }
-        .file-list {
-            list-style-type: none;
-            padding-left: 5px;
+    </style>
+</head>
+<body>
+<div id="chart">
+""".encode('utf-8')
+
+SCRIPT_INICIO = """</div>
+<script>
+    const STORAGE_KEY = 'plotly_visibility';
+""".encode('utf-8')
+
+CLAVE_RANGOS = "    const RANGE_STORAGE_KEY = 'plotly_axis_ranges_{base}';\n"
+
+SCRIPT_FIN = """
+    window.addEventListener('load', () => {
+        const gd = document.querySelector('.js-plotly-plot');
+        const visibility = JSON.parse(localStorage.getItem(STORAGE_KEY));
+        const savedLayout = JSON.parse(localStorage.getItem(RANGE_STORAGE_KEY));
+
+        // Restaurar visibilidad común
+        if (visibility && gd && gd.data) {
+            Plotly.restyle(gd, 'visible', visibility);
         }
-        .file-list li {
-            margin-bottom: 5px;
+
+        // Restaurar rango de ejes específico de este activo
+        if (savedLayout && gd) {
+            Plotly.relayout(gd, savedLayout);
         }
-        .date-header {
-            color: orange;
-            font-weight: bold;
-            margin-top: 15px;
+    });
+
+    window.addEventListener('DOMContentLoaded', () => {
+        const gd = document.querySelector('.js-plotly-plot');
+        if (!gd) return;
+
+        // Guardar visibilidad común
+        gd.on('plotly_legendclick', function(eventData) {
+            const visibilities = gd.data.map(trace => trace.visible || true);
+            const i = eventData.curveNumber;
+            visibilities[i] = visibilities[i] === 'legendonly' ? true : 'legendonly';
+            localStorage.setItem(STORAGE_KEY, JSON.stringify(visibilities));
+        });
+
+        // Guardar rango de ejes específico de este activo
+        gd.on('plotly_relayout', function(eventData) {
+            const ranges = {};
+            for (const key in eventData) {
+                if (key.includes('range')) {
+                    ranges[key] = eventData[key];
+                }
+            }
+            if (Object.keys(ranges).length > 0) {
+                localStorage.setItem(RANGE_STORAGE_KEY, JSON.stringify(ranges));
+            }
+        });
+    });
+</script>
+</body></html>
+""".encode('utf-8')
+
+
+# Marcador que se sustituye en el HTML por la constante JS con el eje x compartido
+X_COMPARTIDO = "__X_COMPARTIDO__"
+
+def cargar_librerias():
+    """Importa las librerías pesadas y prepara lo que depende de ellas (una vez por proceso)"""
+    global np, pd, pa, pacsv, pio, reducir_serie, CSV_READ_OPTIONS, CSV_CONVERT_OPTIONS
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import plotly.io as pio
+
+    from lttb import reducir_serie
+
+    # Lectura con pyarrow: tipos fijos y fechas parseadas en C++ (formato ISO o día primero).
+    # Las señales en float32: la mitad de memoria y a la resolución del gráfico no se nota
+    CSV_READ_OPTIONS = pacsv.ReadOptions(column_names=columnas, autogenerate_column_names=False)
+    CSV_CONVERT_OPTIONS = pacsv.ConvertOptions(
+        column_types={col: (pa.timestamp('s') if col == 'Time' else pa.float32()) for col in columnas},
+        timestamp_parsers=['%Y-%m-%d %H:%M:%S', '%d/%m/%Y %H:%M:%S'],
+    )
+    LAYOUT['template'] = pio.templates[pio.templates.default].to_plotly_json()
+
+    # JSON de la figura con orjson (en Rust, serializa numpy sin pasar por Python) si está instalado
+    try:
+        import orjson  # noqa: F401
+        pio.json.config.default_engine = 'orjson'
+    except ImportError:
+        pass
+
+def bdata(arr, dtype='f8'):
+    """Array como typed array de Plotly.js (en base64) en lugar de lista JSON"""
+    return {'dtype': dtype, 'bdata': base64.b64encode(np.ascontiguousarray(arr, dtype='<' + dtype).tobytes()).decode('ascii')}
+
+def generate_one(ruta_csv, carpeta):
+    """Genera el HTML de un CSV de historial GEX (que aún no tiene HTML); devuelve 1 si lo generó y 0 si no"""
+    base = os.path.splitext(os.path.basename(ruta_csv))[0]  # ej: spy_gex_history
+    nombre_html = os.path.join(carpeta, f"{base}.html")
+
+    print(f"??? Generando: {nombre_html}")
+
+    # Leer CSV (o su copia en Parquet si el CSV no cambió desde la última lectura)
+    cache_path = ruta_csv + ".parquet"
+    try:
+        df = None
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(ruta_csv):
+            try:
+                df = pd.read_parquet(cache_path)
+            except Exception as e:
+                # Copia dañada (p. ej. una ejecución interrumpida): se vuelve a leer el CSV
+                print(f"?? Caché ilegible {cache_path}: {e}")
+        if df is None:
+            tabla = pacsv.read_csv(ruta_csv, read_options=CSV_READ_OPTIONS, convert_options=CSV_CONVERT_OPTIONS)
+            df = tabla.to_pandas(self_destruct=True)
+            df.set_index('Time', inplace=True)
+            # Escritura atómica: una interrupción no deja un Parquet a medias más nuevo que el CSV
+            tmp = cache_path + ".tmp"
+            df.to_parquet(tmp)
+            os.replace(tmp, cache_path)
+
+        # Filtrar datos entre las 08:30 y las 15:15 (máscara vectorizada sobre segundos del día)
+        segundos = df.index.hour * 3600 + df.index.minute * 60 + df.index.second
+        df = df[(segundos >= HORA_INICIO) & (segundos <= HORA_FIN)]
+
+    except Exception as e:
+        print(f"? Error leyendo {ruta_csv}: {e}")
+        return 0
+
+    # Crear figura como diccionario plano (sin pasar por los validadores de go.Figure)
+    traces = []
+    # Tiempo en milisegundos desde epoch, convertido una vez en NumPy para todas las trazas
+    # (Plotly.js no tiene typed array int64: va como float64 sobre un eje de tipo fecha)
+    x = df.index.values.astype('datetime64[ms]').view(np.int64)
+
+    # Todas las señales en una sola matriz; cada traza toma su columna sin crear Series
+    valores = df.to_numpy(dtype=np.float32)
+    for i, col in enumerate(df.columns.tolist()):
+        estilo = estilos.get(col, DEFAULT_ESTILO)
+        marker_props = MARKER_PROPS.get(col, DEFAULT_MARKER)
+
+        n_out = PUNTOS_LINEA if estilo['mode'] == 'lines' else PUNTOS_MARCADOR
+        xs, ys = reducir_serie(x, valores[:, i], n_out)
+
+        # La línea SPOT (la serie densa) va por WebGL; los marcadores dispersos siguen en SVG
+        traza = {
+            'type': 'scattergl' if estilo['mode'] == 'lines' else 'scatter',
+            # Las series sin reducir comparten el eje completo: se escribe una sola vez en la página
+            'x': X_COMPARTIDO if xs is x else bdata(xs),
+            'y': bdata(ys, 'f4'),
+            'mode': estilo['mode'],
+            'name': col,
+            'marker': marker_props,
+            'visible': True if col == 'SPOT' else 'legendonly',
         }
-        .heatmap-link {
-            color: #ff6b6b;
+        if estilo['mode'] == 'lines':
+            traza['line'] = {'color': estilo['color']}
+        traces.append(traza)
+
+    layout = dict(
+        LAYOUT,
+        title=dict(text=f"Evolución indicadores: {base.upper()}"),
+    )
+    fig_html = pio.to_html({'data': traces, 'layout': layout}, validate=False,
+                           full_html=False, include_plotlyjs='cdn', div_id='chart')
+    comparte_x = any(t['x'] is X_COMPARTIDO for t in traces)
+    if comparte_x:
+        fig_html = fig_html.replace(f'"{X_COMPARTIDO}"', 'X_COMPARTIDO')
+
+    # Plantilla fija en bytes; solo la clave de rangos depende del activo
+    with open(nombre_html, "wb") as f:
+        f.write(PAGINA_INICIO)
+        if comparte_x:
+            f.write(b"<script>const X_COMPARTIDO = " + json.dumps(bdata(x)).encode('ascii') + b";</script>\n")
+        f.write(fig_html.encode('utf-8'))
+        f.write(SCRIPT_INICIO)
+        f.write(CLAVE_RANGOS.format(base=base).encode('utf-8'))
+        f.write(SCRIPT_FIN)
+
+    return 1
+
+
+if __name__ == "__main__":
+    # Buscar carpetas con nombre de fecha
+    carpetas = sorted([f for f in os.listdir() if os.path.isdir(f) and f[:4].isdigit()])
+
+    # Un solo recorrido por carpeta: de él salen los CSV pendientes y los datos del índice
+    indice = {}
+    tareas = []
+    for carpeta in carpetas:
+        with os.scandir(carpeta) as it:
+            nombres = sorted(e.name for e in it if e.is_file())
+        existentes = set(nombres)
+        indice[carpeta] = {
+            'gex': [n for n in nombres if n.endswith("gex_history.html")],
+            'flow': [n for n in nombres if n.endswith("_data_flow.html")],
+            'heatmap': [n for n in nombres if "_heatmap" in n and n.endswith(".html")],
         }
-    </style>
-</head>
-<body>
-<h1>GEX Dashboards Completo</h1>
-<table>
-    <thead>
-        <tr>
-            <th>Fecha</th>
-            <th>GEX History</th>
-            <th>Data Flow</th>
-            <th>Heatmaps</th>
-        </tr>
-    </thead>
-    <tbody>
-"""
-
-for carpeta in reversed(carpetas):
-    # Archivos GEX History
-    archivos_gex = sorted(glob.glob(f"{carpeta}/*gex_history.html"))
-    # Archivos Data Flow
-    archivos_flow = sorted(glob.glob(f"{carpeta}/*_data_flow.html"))
-    # Archivos Heatmap
-    archivos_heatmap = sorted(glob.glob(f"{carpeta}/*_heatmap*.html"))
+        for nombre in nombres:
+            if nombre.endswith("_gex_history.csv") and nombre[:-4] + ".html" not in existentes:
+                tareas.append((os.path.join(carpeta, nombre), carpeta))
+
+    # Cada CSV es independiente: se reparten entre procesos (el GIL no deja escalar con hilos).
+    # Si no hay nada pendiente no se llega a importar pandas ni plotly
+    total_generados = 0
+    if tareas:
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=cargar_librerias) as ex:
+            for (ruta_csv, carpeta), generado in zip(tareas, ex.map(generate_one, *zip(*tareas))):
+                if generado:
+                    bisect.insort(indice[carpeta]['gex'], os.path.basename(ruta_csv)[:-4] + ".html")
+                    total_generados += 1
+
+    # Generar índice HTML actualizado con columna de heatmaps
+    partes = ["""<html>
+    <head>
+        <title>GEX Dashboard - Índice Completo</title>
+        <style>
+            body {
+                background-color: black; 
+                color: white; 
+                font-family: Arial;
+                margin: 20px;
+            }
+            h1 {
+                color: cyan;
+                text-align: center;
+            }
+            table {
+                width: 100%;
+                border-collapse: collapse;
+                margin-top: 20px;
+            }
+            th {
+                background-color: #333;
+                color: white;
+                padding: 10px;
+                text-align: left;
+            }
+            td {
+                padding: 8px;
+                border-bottom: 1px solid #444;
+                vertical-align: top;
+            }
+            tr:hover {
+                background-color: #222;
+            }
+            a {
+                color: cyan;
+                text-decoration: none;
+            }
+            a:hover {
+                text-decoration: underline;
+            }
+            .file-list {
+                list-style-type: none;
+                padding-left: 5px;
+            }
+            .file-list li {
+                margin-bottom: 5px;
+            }
+            .date-header {
+                color: orange;
+                font-weight: bold;
+                margin-top: 15px;
+            }
+            .heatmap-link {
+                color: #ff6b6b;
+            }
+        </style>
+    </head>
+    <body>
+    <h1>GEX Dashboards Completo</h1>
+    <table>
+        <thead>
+            <tr>
+                <th>Fecha</th>
+                <th>GEX History</th>
+                <th>Data Flow</th>
+                <th>Heatmaps</th>
+            </tr>
+        </thead>
+        <tbody>
+    """]
+
+    for carpeta in reversed(carpetas):
+        # Archivos GEX History
+        archivos_gex = [f"{carpeta}/{n}" for n in indice[carpeta]['gex']]
+        # Archivos Data Flow
+        archivos_flow = [f"{carpeta}/{n}" for n in indice[carpeta]['flow']]
+        # Archivos Heatmap
+        archivos_heatmap = [f"{carpeta}/{n}" for n in indice[carpeta]['heatmap']]
     
-    html_index += f"""
-    <tr>
-        <td class="date-header">{carpeta}</td>
-        <td>
-            <ul class="file-list">"""
+        partes.append(f"""
+        <tr>
+            <td class="date-header">{carpeta}</td>
+            <td>
+                <ul class="file-list">""")
     
-    for archivo in archivos_gex:
-        nombre = os.path.basename(archivo).replace("_gex_history.html", "").upper()
-        html_index += f'<li><a href="{archivo}">{nombre}</a></li>'
+        for archivo in archivos_gex:
+            nombre = os.path.basename(archivo).replace("_gex_history.html", "").upper()
+            partes.append(f'<li><a href="{archivo}">{nombre}</a></li>')
     
-    html_index += """
-            </ul>
-        </td>
-        <td>
-            <ul class="file-list">"""
+        partes.append("""
+                </ul>
+            </td>
+            <td>
+                <ul class="file-list">""")
     
-    for archivo in archivos_flow:
-        nombre = os.path.basename(archivo).replace("_data_flow.html", "").upper()
-        html_index += f'<li><a href="{archivo}">{nombre}</a></li>'
+        for archivo in archivos_flow:
+            nombre = os.path.basename(archivo).replace("_data_flow.html", "").upper()
+            partes.append(f'<li><a href="{archivo}">{nombre}</a></li>')
     
-    html_index += """
-            </ul>
-        </td>
-        <td>
-            <ul class="file-list">"""
+        partes.append("""
+                </ul>
+            </td>
+            <td>
+                <ul class="file-list">""")
     
-    for archivo in archivos_heatmap:
-        nombre = os.path.basename(archivo).replace(".html", "").upper().replace("_HEATMAP", " HEATMAP")
-        html_index += f'<li><a href="{archivo}" class="heatmap-link">🔥 {nombre}</a></li>'
+        for archivo in archivos_heatmap:
+            nombre = os.path.basename(archivo).replace(".html", "").upper().replace("_HEATMAP", " HEATMAP")
+            partes.append(f'<li><a href="{archivo}" class="heatmap-link">🔥 {nombre}</a></li>')
     
-    html_index += """
-            </ul>
-        </td>
-    </tr>"""
-
-html_index += """
-    </tbody>
-</table>
-<p style="color: gray; font-size: 12px; margin-top: 20px;">
-<strong>Nota:</strong><br>
-• Los gráficos GEX incluyen un botón para alternar entre vista acumulada y directa<br>
-• GEX_BY_OI y GEX_BY_VOLUME solo disponibles en modo acumulado<br>
-• Los Heatmaps muestran correlaciones de datos en tiempo real con escala de colores<br>
-• Todos los gráficos se actualizan automáticamente cada 30 segundos<br>
-• El zoom y configuración se mantienen usando localStorage del navegador
-</p>
-</body></html>"""
-
-with open("index.html", "w", encoding="utf-8") as f:
-    f.write(html_index)
-
-print(f"\n✔ {total_generados} nuevos heatmaps generados")
-print(f"✔ Índice completo actualizado: index_completo.html")
-print(f"📊 Dashboard completo con GEX History, Data Flow y Heatmaps disponible")
\ No newline at end of file
+        partes.append("""
+                </ul>
+            </td>
+        </tr>""")
+
+    partes.append("""
+        </tbody>
+    </table>
+    <p style="color: gray; font-size: 12px; margin-top: 20px;">
+    <strong>Nota:</strong><br>
+    • Los gráficos GEX incluyen un botón para alternar entre vista acumulada y directa<br>
+    • GEX_BY_OI y GEX_BY_VOLUME solo disponibles en modo acumulado<br>
+    • Los Heatmaps muestran correlaciones de datos en tiempo real con escala de colores<br>
+    • Todos los gráficos se actualizan automáticamente cada 30 segundos<br>
+    • El zoom y configuración se mantienen usando localStorage del navegador
+    </p>
+    </body></html>""")
+
+    with open("index.html", "w", encoding="utf-8") as f:
+        f.write(''.join(partes))
+
+    print(f"\n✔ {total_generados} nuevos heatmaps generados")
+    print(f"✔ Índice completo actualizado: index_completo.html")
+    print(f"📊 Dashboard completo con GEX History, Data Flow y Heatmaps disponible")
\ No newline at end of file
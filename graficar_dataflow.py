@@ -1,4 +1,8 @@
-import pandas as pd
+import hashlib
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import plotly.graph_objects as go
 import os
 
@@ -12,11 +16,87 @@ columnas = [
     "PREM_PRESS", "PREM_FLOW", "GAMMA_FLOW", "DELTA_FLOW", "SPOT"
 ]
 
+# pyarrow con tipos fijos: las fechas se parsean en C++ sin pasar por objetos de Python.
+# float32: a la resolución del gráfico no se distingue y el HTML pesa la mitad
+ESQUEMA = pa.schema([(col, pa.timestamp("s") if col == "Time" else pa.float32()) for col in columnas])
+READ_OPTIONS = pacsv.ReadOptions(column_names=columnas, autogenerate_column_names=False)
+CONVERT_OPTIONS = pacsv.ConvertOptions(
+    column_types=dict(zip(ESQUEMA.names, ESQUEMA.types)),
+    timestamp_parsers=["%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S"],
+)
+
+# Filas ya parseadas; en los metadatos se guarda hasta qué byte del CSV llegan
+# y la huella de esos bytes, para detectar un CSV sustituido por otro
+cache_parquet = archivo_csv + ".parquet"
+TAM_HUELLA = 4096
+
+
+def parsear(datos):
+    """Tabla de pyarrow a partir de un trozo del CSV (None si no trae filas)"""
+    if datos.size == 0:
+        return None
+    tabla = pacsv.read_csv(pa.BufferReader(datos), read_options=READ_OPTIONS, convert_options=CONVERT_OPTIONS)
+    return tabla if tabla.num_rows else None
+
+
+def huella(datos, offset):
+    """Hash del principio del CSV y de los bytes justo antes de offset"""
+    h = hashlib.sha1(memoryview(datos[:min(TAM_HUELLA, offset)]))
+    h.update(memoryview(datos[max(0, offset - TAM_HUELLA):offset]))
+    return h.hexdigest()
+
+
+def fin_ultima_linea(datos, desde):
+    """Posición justo después del último salto de línea a partir de desde (desde si no hay)"""
+    fin = datos.size
+    while fin > desde:
+        ini = max(desde, fin - 65536)
+        pos = datos[ini:fin].to_pybytes().rfind(b"\n")
+        if pos >= 0:
+            return ini + pos + 1
+        fin = ini
+    return desde
+
+
+def leer_csv(ruta):
+    """Lee el CSV parseando solo lo añadido desde la última ejecución"""
+    try:
+        tabla = pq.read_table(cache_parquet)
+        offset = int(tabla.schema.metadata[b"offset"])
+        huella_cache = tabla.schema.metadata[b"huella"].decode("ascii")
+        # Parquet guarda las fechas en ms: se vuelve al esquema del CSV para poder concatenar
+        tabla = tabla.replace_schema_metadata(None).cast(ESQUEMA)
+    except (OSError, KeyError, TypeError, ValueError, pa.ArrowException):
+        tabla, offset, huella_cache = None, 0, None
+
+    # El CSV se proyecta en memoria: pyarrow parsea directamente sobre la caché de páginas
+    # del sistema, y los trozos son vistas del mapa (sin copiarlos a un buffer de Python)
+    with pa.memory_map(ruta) as fuente:
+        datos = fuente.read_buffer()
+
+    # Si el CSV ha encogido o ya no empieza igual es que se ha reescrito: se vuelve a leer entero
+    if offset > datos.size or (offset and huella(datos, offset) != huella_cache):
+        tabla, offset = None, 0
+
+    # Solo las líneas completas: una última línea sin salto (el productor aún la está
+    # escribiendo) se descarta y se lee en la siguiente ejecución
+    corte = fin_ultima_linea(datos, offset)
+    nuevas = parsear(datos[offset:corte])
+    if nuevas is not None:
+        tabla = nuevas if tabla is None else pa.concat_tables([tabla, nuevas])
+        tmp = cache_parquet + ".tmp"
+        metadatos = {"offset": str(corte), "huella": huella(datos, corte)}
+        pq.write_table(tabla.replace_schema_metadata(metadatos), tmp)
+        os.replace(tmp, cache_parquet)
+
+    if tabla is None:
+        raise ValueError("el archivo no tiene filas")
+    return tabla.to_pandas(self_destruct=True).set_index("Time")
+
+
 # Leer el archivo
 try:
-    df = pd.read_csv(archivo_csv, header=None, names=columnas)
-    df["Time"] = pd.to_datetime(df["Time"])
-    df.set_index("Time", inplace=True)
+    df = leer_csv(archivo_csv)
 except Exception as e:
     print(f"Error al leer {archivo_csv}: {e}")
     exit(1)
@@ -31,8 +111,16 @@ columnas_dataflow = [
     "GAMMA_FLOW", "DELTA_FLOW"
 ]
 
+# Colores de las barras
+COLORES = {"NET_PRESS": "red", "NET_FLOW": "green", "PREM_PRESS": "magenta",
+           "PREM_FLOW": "cyan", "GAMMA_FLOW": "orange", "DELTA_FLOW": "yellow"}
+
 if acumulado:
-    df[columnas_dataflow] = df[columnas_dataflow].cumsum()
+    # Se acumula en float64 y se vuelve a float32; los huecos siguen vacíos, como con pandas
+    bloque = df[columnas_dataflow].to_numpy(dtype=np.float64)
+    acumulados = np.nancumsum(bloque, axis=0)
+    acumulados[np.isnan(bloque)] = np.nan
+    df[columnas_dataflow] = acumulados.astype(np.float32)
 
 # Crear figura
 fig = go.Figure()
@@ -47,27 +135,29 @@ fig.add_trace(go.Scatter(
     mode="lines"
 ))
 
-# Dataflow sobre eje Y2
-for col in columnas_dataflow:
-    if acumulado:
-        fig.add_trace(go.Scatter(
+# Dataflow sobre eje Y2: el modo no cambia dentro del bucle, se elige la traza una vez
+if acumulado:
+    def crear_traza(col):
+        return go.Scatter(
             x=df.index,
             y=df[col],
             name=col,
             yaxis="y2",
             mode="lines",
             line=dict(shape="hv")
-        ))
-    else:
-        colores = {"NET_PRESS": "red", "NET_FLOW": "green", "PREM_PRESS": "magenta",
-                   "PREM_FLOW": "cyan", "GAMMA_FLOW": "orange", "DELTA_FLOW": "yellow"}
-        fig.add_trace(go.Bar(
+        )
+else:
+    def crear_traza(col):
+        return go.Bar(
             x=df.index,
             y=df[col],
             name=col,
-            marker_color=colores.get(col, "gray"),
+            marker_color=COLORES.get(col, "gray"),
             yaxis="y2"
-        ))
+        )
+
+# Todas las trazas se añaden de una vez (una sola validación y un solo recálculo del layout)
+fig.add_traces([crear_traza(col) for col in columnas_dataflow])
 
 # Configuración layout con dos ejes Y
 fig.update_layout(
@@ -83,5 +173,14 @@ fig.update_layout(
 )
 
 # Guardar como HTML
-fig.write_html("dataflow_dashboard.html", include_plotlyjs="cdn")
+# La figura ya se validó al construirla; sin MathJax y con un id de div fijo
+fig.write_html(
+    "dataflow_dashboard.html",
+    include_plotlyjs="cdn",
+    include_mathjax=False,
+    validate=False,
+    full_html=True,
+    div_id="dataflow",
+    config={"displaylogo": False, "responsive": True}
+)
 print("? Gráfico guardado como 'dataflow_dashboard.html'")
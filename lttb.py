@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+# Backend Rust/SIMD opcional (el mismo que usa plotly-resampler); si no está, LTTB en NumPy
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:
+    MinMaxLTTBDownsampler = None
+
+
+def indices_lttb(x, y, n_out):
+    """Índices que conserva Largest-Triangle-Three-Buckets sobre x, y (float64, sin NaN)"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[-1] = n - 1
+
+    # Los puntos interiores se reparten en n_out - 2 buckets
+    bordes = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    a = 0
+    for i in range(n_out - 2):
+        ini, fin = bordes[i], bordes[i + 1]
+
+        # Vértice C: promedio del bucket siguiente (o el último punto)
+        if i < n_out - 3:
+            sig_ini, sig_fin = bordes[i + 1], bordes[i + 2]
+            cx, cy = x[sig_ini:sig_fin].mean(), y[sig_ini:sig_fin].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+
+        # Se queda el punto del bucket que forma el triángulo de mayor área con A y C
+        ax, ay = x[a], y[a]
+        areas = np.abs((ax - cx) * (y[ini:fin] - ay) - (ax - x[ini:fin]) * (cy - ay))
+        a = ini + int(np.argmax(areas))
+        idx[i + 1] = a
+
+    return idx
+
+
+def reducir_serie(x, y, n_out):
+    """Reduce una serie temporal a n_out puntos como máximo conservando su forma.
+
+    x puede ser datetime64; los NaN de y (marcadores sin señal) se descartan antes
+    de reducir. Si la serie ya es corta se devuelve sin tocar.
+    """
+    validos = ~np.isnan(y)
+    if np.count_nonzero(validos) <= n_out:
+        return x, y
+
+    x, y = x[validos], y[validos]
+    if MinMaxLTTBDownsampler is not None:
+        idx = MinMaxLTTBDownsampler().downsample(x.astype(np.int64), y.astype(np.float64), n_out=n_out)
+    else:
+        idx = indices_lttb(x.astype(np.int64).astype(np.float64), y.astype(np.float64), n_out)
+    return x[idx], y[idx]